@@ -25,3 +25,16 @@ class Cfg:
     TEMPERATURE = float(os.getenv("TEMPERATURE", "0.2"))
 
 cfg = Cfg()
+
+EMBED_KEYS = ("embed_provider", "embed_model")       # must match for vectors to be comparable
+CHUNK_KEYS = ("chunker", "chunk_size", "chunk_overlap")  # only affects how new text is split
+
+def index_settings() -> dict:
+    """Settings that determine how a collection's vectors were built (stored as collection metadata)."""
+    return {
+        "embed_provider": cfg.EMBED_PROVIDER,
+        "embed_model": cfg.GEMINI_EMBED_MODEL,
+        "chunker": cfg.CHUNKER,
+        "chunk_size": cfg.CHUNK_SIZE,
+        "chunk_overlap": cfg.CHUNK_OVERLAP,
+    }
@@ -1,7 +1,7 @@
 # app/ingestion.py
 import os, sys, uuid, traceback
 from pypdf import PdfReader
-from app.config import cfg
+from app.config import cfg, index_settings, EMBED_KEYS, CHUNK_KEYS
 from app.chunkers.sentence import sentence_chunk
 from app.chunkers.token import token_chunk
 from app.embed.gemini_embed import GeminiEmbedder
@@ -20,6 +20,27 @@ def choose_chunker():
         return lambda t: token_chunk(t, cfg.CHUNK_SIZE, cfg.CHUNK_OVERLAP)
     return lambda t: sentence_chunk(t, cfg.CHUNK_SIZE, cfg.CHUNK_OVERLAP)
 
+def check_append_settings(store: ChromaStore):
+    """
+    Appending must use the embed model the collection was built with, otherwise vectors
+    from two models end up mixed under one recorded model.
+    """
+    meta = store.col.metadata or {}
+    current = index_settings()
+    for key in EMBED_KEYS:
+        if key in meta and meta[key] != current[key]:
+            raise ValueError(
+                f"Collection '{store.collection_name}' was built with {key}={meta[key]!r} but current "
+                f"config uses {current[key]!r}. Reset the collection or switch config to match."
+            )
+    for key in CHUNK_KEYS:
+        if key in meta and meta[key] != current[key]:
+            print(f"[ingestion] ⚠️ {key} differs (collection={meta[key]!r}, config={current[key]!r}); "
+                  "new chunks will be split differently.")
+    if store.count() and any(key not in meta for key in EMBED_KEYS):
+        print(f"[ingestion] ⚠️ Collection '{store.collection_name}' has no recorded embed settings; "
+              "can't verify it was built with the current embed model.")
+
 def run_ingest(pdf_paths: list[str], collection: str = "pdf_rag", reset_collection: bool = False) -> int:
     """
     Ingest PDFs → chunk → embed → upsert to Chroma.
@@ -30,10 +51,12 @@ def run_ingest(pdf_paths: list[str], collection: str = "pdf_rag", reset_collecti
     print(f"[ingestion] INDEX_DIR={cfg.INDEX_DIR} • COLLECTION={collection} • RESET={reset_collection}")
 
     embedder = GeminiEmbedder()
-    store = ChromaStore(collection, embedder)
+    store = ChromaStore(collection, embedder, metadata=index_settings())
     if reset_collection:
         print("[ingestion] Resetting collection …")
         store.reset_collection()
+    else:
+        check_append_settings(store)
 
     splitter = choose_chunker()
 
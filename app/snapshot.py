@@ -0,0 +1,212 @@
+# app/snapshot.py
+import os, sys, json, traceback
+import numpy as np
+from app.config import cfg, index_settings, EMBED_KEYS, CHUNK_KEYS
+from app.vector.chroma_store import ChromaStore
+
+SNAPSHOT_VERSION = 1
+
+def _pack_strings(strings: list[str | None]):
+    """list[str | None] → (utf-8 blob as uint8, int64 end offsets, None mask). Avoids pickled object arrays."""
+    encoded = [(s or "").encode("utf-8") for s in strings]
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    ends = np.cumsum([len(b) for b in encoded], dtype=np.int64)
+    nulls = np.array([s is None for s in strings], dtype=bool)
+    return blob, ends, nulls
+
+def _unpack_strings(blob: np.ndarray, ends: np.ndarray, nulls: np.ndarray) -> list[str | None]:
+    raw = blob.tobytes()
+    out, start = [], 0
+    for end, is_null in zip(ends.tolist(), nulls.tolist()):
+        out.append(None if is_null else raw[start:end].decode("utf-8"))
+        start = end
+    return out
+
+def _hnsw_configuration(col) -> dict | None:
+    """Full HNSW config (space, ef_construction, ef_search, max_neighbors, …) on newer Chroma."""
+    try:
+        return dict(col.configuration["hnsw"])
+    except Exception:
+        return None
+
+def collection_settings(col, assume_config: bool = False) -> dict:
+    """
+    Index settings recorded on the collection at ingest time; refuse if absent or ≠ current config.
+    assume_config=True records the current config on a collection that has none (pre-snapshot
+    indexes) — only use it when you know the collection was built with these settings.
+    """
+    meta = col.metadata or {}
+    current = index_settings()
+    missing = [k for k in current if k not in meta]
+    if missing and assume_config:
+        print(f"[snapshot] Recording current settings on '{col.name}' (--assume-config): {current}")
+        # modify() replaces metadata and can't carry hnsw:* keys; the space stays in the configuration
+        kept = {k: v for k, v in meta.items() if not k.startswith("hnsw:")}
+        col.modify(metadata={**kept, **{k: current[k] for k in missing}})
+        meta = col.metadata or {}
+    elif missing:
+        raise ValueError(
+            f"Collection '{col.name}' has no recorded {', '.join(missing)}. If it was built with the "
+            "current config, export with assume_config=True (CLI: --assume-config)."
+        )
+    for key, value in current.items():
+        if meta[key] != value:
+            raise ValueError(
+                f"Collection '{col.name}' was built with {key}={meta[key]!r} but current config uses "
+                f"{value!r}. Export with the config the collection was ingested with."
+            )
+    return {k: meta[k] for k in current}
+
+def export_snapshot(path: str, collection: str = "pdf_rag", assume_config: bool = False) -> int:
+    """
+    Dump a Chroma collection → single .npz (ids, texts, metadata, float16 embeddings + manifest).
+    Returns number of chunks written. Raises if the collection is missing or empty.
+    assume_config: see collection_settings().
+    """
+    store = ChromaStore(collection, embedder=None, create=False)
+    if store.count() == 0:
+        raise ValueError(f"Collection '{collection}' is empty; nothing to export.")
+    settings = collection_settings(store.col, assume_config=assume_config)
+
+    ids, texts, metas, embs = [], [], [], []
+    for batch in store.iter_records():
+        ids.extend(batch["ids"])
+        texts.extend(batch["documents"])
+        metas.extend(json.dumps(m) for m in batch["metadatas"])  # None → "null"
+        embs.append(np.asarray(batch["embeddings"], dtype=np.float16))
+    vectors = np.concatenate(embs)
+
+    col_meta = dict(store.col.metadata or {})
+    hnsw = _hnsw_configuration(store.col)
+    if hnsw:  # configuration is authoritative; drop legacy hnsw:* metadata so they can't conflict
+        col_meta = {k: v for k, v in col_meta.items() if not k.startswith("hnsw:")}
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "collection": collection,
+        "count": len(ids),
+        "dim": int(vectors.shape[1]),
+        "collection_metadata": col_meta,
+        "hnsw": hnsw,
+        **settings,
+    }
+
+    ids_blob, ids_ends, ids_nulls = _pack_strings(ids)
+    txt_blob, txt_ends, txt_nulls = _pack_strings(texts)
+    meta_blob, meta_ends, meta_nulls = _pack_strings(metas)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:  # file handle so numpy doesn't append ".npz"
+        np.savez_compressed(
+            f,
+            manifest=np.frombuffer(json.dumps(manifest).encode("utf-8"), dtype=np.uint8),
+            ids=ids_blob, ids_ends=ids_ends, ids_nulls=ids_nulls,
+            texts=txt_blob, texts_ends=txt_ends, texts_nulls=txt_nulls,
+            metas=meta_blob, metas_ends=meta_ends, metas_nulls=meta_nulls,
+            embeddings=vectors,
+        )
+    print(f"[snapshot] ✅ Exported {len(ids)} chunks (dim={manifest['dim']}) from '{collection}' → {path}")
+    return len(ids)
+
+def read_manifest(data) -> dict:
+    return json.loads(data["manifest"].tobytes().decode("utf-8"))
+
+def check_compatible(manifest: dict):
+    """Refuse snapshots whose vectors the current embedder can't query against."""
+    version = manifest.get("version")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION}).")
+    if not manifest.get("count"):
+        raise ValueError("Snapshot is empty; refusing to replace the collection with nothing.")
+    current = index_settings()
+    for key in EMBED_KEYS:
+        if manifest.get(key) != current[key]:
+            raise ValueError(
+                f"Snapshot was built with {key}={manifest.get(key)!r} but current config uses "
+                f"{current[key]!r}. Re-ingest instead, or switch config to match."
+            )
+    for key in CHUNK_KEYS:
+        if manifest.get(key) != current[key]:
+            print(f"[snapshot] ⚠️ {key} differs (snapshot={manifest.get(key)!r}, config={current[key]!r}); "
+                  "new ingests into this collection will be chunked differently.")
+
+def import_snapshot(path: str, collection: str = "pdf_rag") -> int:
+    """
+    Load a snapshot → Chroma with pre-computed vectors (no embedding calls).
+    Rows are written to a '<collection>-restore' staging collection first; if that fails the
+    staging collection is dropped and the existing collection is not touched. Only after every
+    row is written is the old collection deleted and the staging one renamed in its place.
+    Returns number of chunks written.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    with np.load(path, allow_pickle=False) as data:
+        manifest = read_manifest(data)
+        check_compatible(manifest)
+        ids = _unpack_strings(data["ids"], data["ids_ends"], data["ids_nulls"])
+        texts = _unpack_strings(data["texts"], data["texts_ends"], data["texts_nulls"])
+        metas = [json.loads(m) for m in _unpack_strings(data["metas"], data["metas_ends"], data["metas_nulls"])]
+        vectors = data["embeddings"]
+
+    count = manifest["count"]
+    if not (len(ids) == len(texts) == len(metas) == len(vectors) == count):
+        raise ValueError(f"Corrupt snapshot: row counts disagree with manifest count={count}.")
+
+    os.makedirs(cfg.INDEX_DIR, exist_ok=True)
+    print(f"[snapshot] INDEX_DIR={cfg.INDEX_DIR} • COLLECTION={collection}")
+    tmp_name = f"{collection}-restore"
+    hnsw = manifest.get("hnsw")
+    staging = ChromaStore(tmp_name, embedder=None, metadata=manifest["collection_metadata"] or None,
+                          configuration={"hnsw": hnsw} if hnsw else None)
+    staging.reset_collection()  # drop leftovers of an earlier interrupted import
+
+    print(f"[snapshot] Restoring {count} chunks (dim={manifest['dim']}) to '{tmp_name}' …")
+    try:
+        staging.add_embedded(ids, texts, metas, vectors)
+        if staging.count() != count:
+            raise RuntimeError(f"Restore incomplete: wrote {staging.count()} of {count} chunks.")
+    except Exception:
+        try:
+            staging.client.delete_collection(tmp_name)
+        except Exception:
+            pass
+        print(f"[snapshot] Restore failed; dropped '{tmp_name}', '{collection}' left unchanged.")
+        raise
+
+    try:
+        staging.client.delete_collection(collection)
+    except Exception:
+        pass  # ok if it didn't exist
+    try:
+        staging.col.modify(name=collection)
+    except Exception as e:
+        raise RuntimeError(
+            f"Removed old '{collection}' but could not rename '{tmp_name}' to it ({e}); "
+            f"restored data is in '{tmp_name}'."
+        ) from e
+
+    restored = ChromaStore(collection, embedder=None, create=False).count()
+    if restored != count:
+        raise RuntimeError(f"Restore incomplete: '{collection}' has {restored} of {count} chunks.")
+    print(f"[snapshot] ✅ Restored {restored} chunks. Index at: {cfg.INDEX_DIR}")
+    return restored
+
+if __name__ == "__main__":
+    try:
+        args = sys.argv[1:]
+        assume_config = "--assume-config" in args
+        args = [a for a in args if a != "--assume-config"]
+        if len(args) not in (2, 3) or args[0] not in ("export", "import") or (assume_config and args[0] != "export"):
+            print("Usage: python -m app.snapshot export [--assume-config] <snapshot.npz> [<collection>]\n"
+                  "       python -m app.snapshot import <snapshot.npz> [<collection>]")
+            sys.exit(1)
+        cmd, path = args[0], args[1]
+        collection = args[2] if len(args) == 3 else "pdf_rag"
+        if cmd == "export":
+            n = export_snapshot(path, collection=collection, assume_config=assume_config)
+        else:
+            n = import_snapshot(path, collection=collection)
+        print(f"{cmd.capitalize()}ed {n} chunks.")
+    except Exception as e:
+        print("❌ Snapshot failed:", e)
+        traceback.print_exc()
+        sys.exit(2)
@@ -1,15 +1,33 @@
 # app/vector/chroma_store.py
 import chromadb
+import numpy as np
 from collections import defaultdict
 from app.config import cfg
 
 class ChromaStore:
-    def __init__(self, collection_name: str, embedder):
+    def __init__(self, collection_name: str, embedder, metadata: dict | None = None,
+                 create: bool = True, configuration: dict | None = None):
+        """
+        metadata: collection metadata written when the collection is created (e.g. index settings).
+        configuration: Chroma collection configuration used on create (e.g. {"hnsw": {...}}).
+        create=False opens an existing collection only (raises if it doesn't exist).
+        """
         self.client = chromadb.PersistentClient(path=cfg.INDEX_DIR)
         self.collection_name = collection_name
-        self.col = self.client.get_or_create_collection(name=self.collection_name)
+        self.metadata = metadata
+        self.configuration = configuration
+        if create:
+            self.col = self._get_or_create()
+            if metadata and not self.col.metadata and self.count() == 0:
+                self.col.modify(metadata=metadata)  # empty collection created elsewhere without settings
+        else:
+            self.col = self.client.get_collection(name=self.collection_name)
         self.embedder = embedder
 
+    def _get_or_create(self):
+        extra = {"configuration": self.configuration} if self.configuration else {}
+        return self.client.get_or_create_collection(name=self.collection_name, metadata=self.metadata, **extra)
+
     # ---- lifecycle ----
     def reset_collection(self):
         """Drop and recreate the current collection (fresh, empty)."""
@@ -17,7 +35,7 @@ class ChromaStore:
             self.client.delete_collection(self.collection_name)
         except Exception:
             pass  # ok if it didn't exist
-        self.col = self.client.get_or_create_collection(name=self.collection_name)
+        self.col = self._get_or_create()
 
     def count(self) -> int:
         try:
@@ -40,6 +58,30 @@ class ChromaStore:
             embeddings=embeddings,
         )
 
+    def _max_batch_size(self) -> int:
+        """Largest add() batch the Chroma backend accepts (older clients don't report it)."""
+        try:
+            return int(self.client.get_max_batch_size())
+        except Exception:
+            return 5000
+
+    def add_embedded(self, ids: list[str], texts: list[str], metas: list[dict], embeddings) -> int:
+        """
+        Write pre-computed vectors (e.g. from a snapshot) without calling the embedder.
+        embeddings: array of shape (n, dim). Sent in the largest batches Chroma allows.
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        step = self._max_batch_size()
+        for start in range(0, len(ids), step):
+            end = start + step
+            self.col.add(
+                ids=ids[start:end],
+                documents=texts[start:end],
+                metadatas=metas[start:end],
+                embeddings=vectors[start:end],
+            )
+        return len(ids)
+
     # ---- reads ----
     def _diversify_by_page(self, items: list[dict], k: int, per_page_cap: int = 2) -> list[dict]:
         """Round‑robin across pages so we cover the document broadly."""
@@ -107,6 +149,21 @@ class ChromaStore:
             return self._diversify_by_page(items, k=k, per_page_cap=per_page_cap)
         return items[:k]
 
+    def iter_records(self, batch_size: int = 5000):
+        """Page through the whole collection → yields {ids, documents, metadatas, embeddings} batches."""
+        offset = 0
+        while True:
+            got = self.col.get(
+                limit=batch_size,
+                offset=offset,
+                include=["documents", "metadatas", "embeddings"],
+            )
+            ids = got.get("ids") or []
+            if not len(ids):
+                break
+            yield got
+            offset += len(ids)
+
     def get_texts_by_ids(self, ids: list[str]) -> dict[str, str]:
         """Fetch documents by id → {id: text}"""
         if not ids:
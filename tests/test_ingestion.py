@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+import app.ingestion as ingestion
+from app.config import cfg, index_settings
+from app.vector.chroma_store import ChromaStore
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cfg, "INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setattr(ingestion, "GeminiEmbedder", lambda: None)
+    return tmp_path
+
+
+def _seed(n=2, dim=8):
+    store = ChromaStore("pdf_rag", embedder=None, metadata=index_settings())
+    store.add_embedded([f"id-{i}" for i in range(n)], ["text"] * n, [{"page": i} for i in range(n)],
+                       np.ones((n, dim), dtype=np.float32))
+
+
+def test_append_refuses_different_embed_model(index_dir, monkeypatch):
+    _seed()
+    monkeypatch.setattr(cfg, "GEMINI_EMBED_MODEL", "other-model")
+    with pytest.raises(ValueError, match="embed_model"):
+        ingestion.run_ingest([str(index_dir / "new.pdf")])
+    store = ChromaStore("pdf_rag", embedder=None, create=False)
+    assert store.count() == 2
+    assert store.col.metadata["embed_model"] != "other-model"
+
+
+def test_append_warns_on_chunker_change(index_dir, monkeypatch, capsys):
+    _seed()
+    monkeypatch.setattr(cfg, "CHUNK_SIZE", cfg.CHUNK_SIZE + 1)
+    with pytest.raises(FileNotFoundError):  # settings check passes, then the missing PDF is reported
+        ingestion.run_ingest([str(index_dir / "new.pdf")])
+    assert "chunk_size differs" in capsys.readouterr().out
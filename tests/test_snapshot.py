@@ -0,0 +1,153 @@
+import numpy as np
+import pytest
+from chromadb.api.models.Collection import Collection
+
+from app.config import cfg, index_settings
+from app.snapshot import (
+    SNAPSHOT_VERSION, _pack_strings, _unpack_strings, check_compatible, export_snapshot, import_snapshot,
+)
+from app.vector.chroma_store import ChromaStore
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cfg, "INDEX_DIR", str(tmp_path / "index"))
+    return tmp_path
+
+
+def _seed(collection="pdf_rag", n=3, dim=8, stamped=True, configuration=None):
+    store = ChromaStore(collection, embedder=None, metadata=index_settings() if stamped else None,
+                        configuration=configuration)
+    ids = [f"id-{i}" for i in range(n)]
+    texts = ["Grüße, 東京 ✓", None] + [f"chunk {i}" for i in range(2, n)]
+    metas = [{"source": "ä.pdf", "page": 1}, None] + [{"source": "b.pdf", "page": i} for i in range(2, n)]
+    vectors = np.random.default_rng(0).random((n, dim), dtype=np.float32)
+    store.add_embedded(ids, texts, metas, vectors)
+    return ids, texts, metas, vectors
+
+
+def test_pack_roundtrip_non_ascii_and_none():
+    strings = ["", "plain", "Grüße, 東京 ✓", None, "🙂"]
+    assert _unpack_strings(*_pack_strings(strings)) == strings
+
+
+def test_export_import_roundtrip(index_dir):
+    ids, texts, metas, vectors = _seed()
+    path = str(index_dir / "snap.npz")
+    assert export_snapshot(path) == 3
+
+    ChromaStore("pdf_rag", embedder=None).reset_collection()
+    assert import_snapshot(path) == 3
+
+    store = ChromaStore("pdf_rag", embedder=None, create=False)
+    got = store.col.get(ids=ids, include=["documents", "metadatas", "embeddings"])
+    by_id = dict(zip(got["ids"], zip(got["documents"], got["metadatas"], got["embeddings"])))
+    for i, _id in enumerate(ids):
+        doc, meta, emb = by_id[_id]
+        assert doc == texts[i]
+        assert meta == metas[i]
+        np.testing.assert_allclose(emb, vectors[i], atol=1e-3)
+    assert store.col.metadata["embed_model"] == cfg.GEMINI_EMBED_MODEL
+    assert [c.name for c in store.client.list_collections()] == ["pdf_rag"]
+
+
+def test_export_refuses_missing_or_empty_collection(index_dir):
+    with pytest.raises(Exception):
+        export_snapshot(str(index_dir / "snap.npz"), collection="nope_missing")
+    store = ChromaStore("pdf_rag", embedder=None, metadata=index_settings())
+    assert "nope_missing" not in [c.name for c in store.client.list_collections()]
+    with pytest.raises(ValueError, match="empty"):
+        export_snapshot(str(index_dir / "snap.npz"))
+
+
+def test_export_refuses_unrecorded_or_mismatched_model(index_dir, monkeypatch):
+    _seed(stamped=False)
+    with pytest.raises(ValueError, match="no recorded"):
+        export_snapshot(str(index_dir / "snap.npz"))
+
+    ChromaStore("pdf_rag", embedder=None).client.delete_collection("pdf_rag")
+    _seed()
+    monkeypatch.setattr(cfg, "GEMINI_EMBED_MODEL", "other-model")
+    with pytest.raises(ValueError, match="embed_model"):
+        export_snapshot(str(index_dir / "snap.npz"))
+
+
+def test_export_assume_config_records_settings(index_dir):
+    _seed(stamped=False, configuration={"hnsw": {"space": "cosine"}})
+    path = str(index_dir / "snap.npz")
+    with pytest.raises(ValueError, match="assume_config"):
+        export_snapshot(path)
+
+    assert export_snapshot(path, assume_config=True) == 3
+    store = ChromaStore("pdf_rag", embedder=None, create=False)
+    assert {k: store.col.metadata[k] for k in index_settings()} == index_settings()
+    assert store.col.configuration["hnsw"]["space"] == "cosine"
+
+
+def test_import_keeps_hnsw_configuration(index_dir):
+    hnsw = {"space": "cosine", "ef_construction": 150, "ef_search": 64, "max_neighbors": 24}
+    _seed(configuration={"hnsw": hnsw})
+    path = str(index_dir / "snap.npz")
+    export_snapshot(path)
+    ChromaStore("pdf_rag", embedder=None).client.delete_collection("pdf_rag")
+
+    import_snapshot(path)
+    restored = ChromaStore("pdf_rag", embedder=None, create=False).col.configuration["hnsw"]
+    assert {k: restored[k] for k in hnsw} == hnsw
+
+
+def test_failed_import_leaves_target_and_no_staging(index_dir, monkeypatch):
+    _seed(n=4)
+    path = str(index_dir / "snap.npz")
+    export_snapshot(path)
+    target = ChromaStore("pdf_rag", embedder=None, create=False)
+    before = target.col.get()["ids"]
+
+    calls = {"n": 0}
+    real_add = Collection.add
+
+    def flaky_add(self, *args, **kwargs):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("boom")
+        return real_add(self, *args, **kwargs)
+
+    monkeypatch.setattr(ChromaStore, "_max_batch_size", lambda self: 2)
+    monkeypatch.setattr(Collection, "add", flaky_add)
+    with pytest.raises(RuntimeError, match="boom"):
+        import_snapshot(path)
+
+    assert calls["n"] == 2
+    assert sorted(ChromaStore("pdf_rag", embedder=None, create=False).col.get()["ids"]) == sorted(before)
+    assert [c.name for c in target.client.list_collections()] == ["pdf_rag"]
+
+
+def test_import_refuses_model_mismatch_without_touching_target(index_dir, monkeypatch):
+    _seed()
+    path = str(index_dir / "snap.npz")
+    export_snapshot(path)
+
+    monkeypatch.setattr(cfg, "GEMINI_EMBED_MODEL", "other-model")
+    with pytest.raises(ValueError, match="embed_model"):
+        import_snapshot(path)
+    assert ChromaStore("pdf_rag", embedder=None, create=False).count() == 3
+
+
+def test_check_compatible_refuses_empty_snapshot():
+    with pytest.raises(ValueError, match="empty"):
+        check_compatible({"version": SNAPSHOT_VERSION, "count": 0, **index_settings()})
+
+
+def test_failed_rename_points_to_staging(index_dir, monkeypatch):
+    _seed()
+    path = str(index_dir / "snap.npz")
+    export_snapshot(path)
+
+    def no_rename(self, name=None, **kwargs):
+        raise RuntimeError("rename unsupported")
+
+    monkeypatch.setattr(Collection, "modify", no_rename)
+    with pytest.raises(RuntimeError, match="restored data is in 'pdf_rag-restore'"):
+        import_snapshot(path)
+    store = ChromaStore("pdf_rag-restore", embedder=None, create=False)
+    assert store.count() == 3